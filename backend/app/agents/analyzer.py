@@ -1,17 +1,25 @@
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 class AnalyzerAgent:
-	def __init__(self, reports_dir: str):
+	def __init__(self, reports_dir: str, data_dir: Optional[str] = None):
 		self.reports_dir = Path(reports_dir)
+		# Visual regression baselines and the perceptual-hash index live under data_dir; None disables it
+		self.data_dir = Path(data_dir) if data_dir else None
 
 	def analyze_run(self, run_id: str, artifacts_dir: str) -> Dict:
 		art_dir = Path(artifacts_dir) / run_id
 		results_file = art_dir / "results.json"
+		load = self._load_section(art_dir)
 		if not results_file.exists():
-			return {"run_id": run_id, "summary": {"total": 0}, "tests": []}
+			report = {"run_id": run_id, "summary": {"total": 0}, "tests": []}
+			if load:
+				report["load"] = load
+			return report
 		all_results: List[dict] = json.loads(results_file.read_text())
+		visual = self._visual_section(run_id, all_results)
+		visual_by_run = {(v["case_id"], v["browser"]): v for v in (visual or {}).pop("results", [])}
 		# Group by case_id
 		by_case: Dict[str, List[dict]] = {}
 		for r in all_results:
@@ -19,11 +27,21 @@ class AnalyzerAgent:
 		report_tests: List[dict] = []
 		for case_id, runs in by_case.items():
 			statuses = [r["result"]["status"] for r in runs]
-			pass_count = statuses.count("completed")
-			error_count = statuses.count("error")
+			visuals = {r["browser"]: visual_by_run[(case_id, r["browser"])] for r in runs if (case_id, r["browser"]) in visual_by_run}
+			# A run that completed but renders differently from its baseline is a failure too
+			regressed = [visuals.get(r["browser"], {}).get("visual") == "changed" for r in runs]
+			pass_count = sum(1 for st, rg in zip(statuses, regressed) if st == "completed" and not rg)
+			error_count = sum(1 for st, rg in zip(statuses, regressed) if st == "error" or rg)
 			flaky = pass_count > 0 and error_count > 0
 			verdict = "pass" if error_count == 0 else ("flaky" if flaky else "fail")
 			artifacts = {r["browser"]: r.get("artifacts", {}) for r in runs}
+			notes = []
+			if statuses.count("error"):
+				notes.append("Errors observed")
+			if any(regressed):
+				notes.append("Visual regression")
+			if any(v.get("visual") == "changed_unreviewed" for v in visuals.values()):
+				notes.append("Differs from unreviewed baseline")
 			report_tests.append({
 				"case_id": case_id,
 				"runs": runs,
@@ -34,7 +52,8 @@ class AnalyzerAgent:
 					"successes": pass_count,
 					"consistency": round(pass_count / max(1, len(runs)), 2),
 				},
-				"triage_notes": "Errors observed" if error_count else "No errors",
+				"triage_notes": "; ".join(notes) if notes else "No errors",
+				**({"visual": visuals} if visuals else {}),
 			})
 		summary = {
 			"total": len(report_tests),
@@ -42,4 +61,41 @@ class AnalyzerAgent:
 			"fail": sum(1 for t in report_tests if t["verdict"] == "fail"),
 			"flaky": sum(1 for t in report_tests if t["verdict"] == "flaky"),
 		}
-		return {"run_id": run_id, "summary": summary, "tests": report_tests}
+		report = {"run_id": run_id, "summary": summary, "tests": report_tests}
+		if visual:
+			report["visual"] = visual
+		if load:
+			report["load"] = load
+		return report
+
+	def _visual_section(self, run_id: str, results: List[dict]) -> Optional[Dict]:
+		if self.data_dir is None:
+			return None
+		# Imported lazily so NumPy/Pillow stay out of backend startup
+		# Visual problems (missing deps, unreadable baselines, unwritable data dir) must never cost the
+		# status-based report, so any failure here just disables the stage for this run
+		try:
+			from .visual import VisualRegressionAgent
+			return {"enabled": True, **VisualRegressionAgent(str(self.data_dir)).compare_run(run_id, results)}
+		except Exception as e:
+			return {"enabled": False, "reason": f"{type(e).__name__}: {e}"}
+
+	def _load_section(self, art_dir: Path) -> Optional[Dict]:
+		# Written by LoadTesterAgent; per-player raw timings stay in artifacts/<run_id>/load/
+		load_file = art_dir / "load.json"
+		if not load_file.exists():
+			return None
+		load = json.loads(load_file.read_text())
+		return {
+			"config": load.get("config", {}),
+			"aggregate": load.get("aggregate", {}),
+			"players": [
+				{
+					"player_id": p.get("player_id"),
+					"completed": p.get("completed", 0),
+					"iterations": p.get("iterations", 0),
+					"errors": len(p.get("errors", [])),
+				}
+				for p in load.get("players", [])
+			],
+		}
@@ -0,0 +1,205 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .executor import ExecutorAgent, TARGET_URL, DEFAULT_NAV_TIMEOUT_MS, DEFAULT_ACTION_TIMEOUT_MS
+
+JOB_TIMEOUT_S = float(os.getenv("POOL_JOB_TIMEOUT_S", "600"))
+
+
+class BrowserPoolUnavailable(RuntimeError):
+	"""The job never ran on a pooled browser; it is safe to run it some other way."""
+
+
+class BrowserPool:
+	"""Keeps the Playwright driver and browsers launched on one dedicated thread.
+
+	The sync Playwright API is bound to the thread that started it, so callers hand work to
+	the pool thread via run()/submit() instead of touching the browsers directly.
+	"""
+
+	def __init__(self, browsers: List[str], storage_state_path: Optional[str] = None, target_url: Optional[str] = None):
+		self.browser_names = browsers
+		self.storage_state_path = storage_state_path
+		self.target_url = target_url or TARGET_URL
+		self.browsers: Dict[str, object] = {}
+		self.dropped: Dict[str, str] = {}
+		self.relaunches = 0
+		self.ready = threading.Event()
+		self.error: Optional[str] = None
+		self.state_error: Optional[str] = None
+		self._jobs: "queue.Queue[Optional[tuple]]" = queue.Queue()
+		self._thread: Optional[threading.Thread] = None
+		self._playwright = None
+		# Guards _closed so nothing is queued after the pool thread has failed its pending jobs
+		self._lock = threading.Lock()
+		self._closed = False
+
+	def start(self):
+		if self._thread is not None:
+			return
+		self._thread = threading.Thread(target=self._serve, name="browser-pool", daemon=True)
+		self._thread.start()
+
+	def stop(self, timeout: float = 10.0):
+		if self._thread is None:
+			return
+		self._jobs.put(None)
+		self._thread.join(timeout=timeout)
+		self._thread = None
+		self._close()
+
+	def has(self, browser_name: str) -> bool:
+		# Jobs queue up behind warm-up, so a pool that is still starting counts as available
+		return (self._thread is not None and not self._closed and self.error is None
+			and browser_name in self.browser_names and browser_name not in self.dropped)
+
+	def storage_state(self, wait: Optional[float] = None) -> Optional[str]:
+		# The file only describes this boot once warm-up has finished; callers outside the pool
+		# thread pass `wait` so early cases do not start without the state later ones get
+		if wait is not None and not self.ready.wait(wait):
+			return None
+		if not self.ready.is_set() or self.state_error is not None:
+			return None
+		if self.storage_state_path and Path(self.storage_state_path).exists():
+			return self.storage_state_path
+		return None
+
+	def submit(self, browser_name: str, fn: Callable[[object], object]) -> Future:
+		fut: Future = Future()
+		with self._lock:
+			if self._closed:
+				fut.set_exception(BrowserPoolUnavailable("browser pool stopped"))
+			else:
+				self._jobs.put((browser_name, fn, fut))
+		return fut
+
+	def run(self, browser_name: str, fn: Callable[[object], object], timeout: Optional[float] = None):
+		fut = self.submit(browser_name, fn)
+		try:
+			return fut.result(timeout=timeout or JOB_TIMEOUT_S)
+		except FutureTimeout:
+			# Still queued: it never ran, so the caller may fall back. Already running: report the timeout.
+			if fut.cancel():
+				raise BrowserPoolUnavailable("timed out waiting for the browser pool")
+			raise
+
+	def status(self) -> Dict:
+		return {
+			"browsers": self.browser_names,
+			"ready": self.ready.is_set(),
+			"launched": sorted(self.browsers),
+			"dropped": self.dropped,
+			"relaunches": self.relaunches,
+			"storage_state": self.storage_state(),
+			"error": self.error,
+			"state_error": self.state_error,
+		}
+
+	def _serve(self):
+		try:
+			from playwright.sync_api import sync_playwright
+			with sync_playwright() as p:
+				self._playwright = p
+				# A browser that fails to launch (e.g. not installed) is dropped on its own;
+				# self.error is reserved for driver-level failures
+				for name in self.browser_names:
+					try:
+						self.browsers[name] = self._launch(name)
+					except Exception as e:
+						self.dropped[name] = str(e)
+				if self.storage_state_path:
+					try:
+						self._install_state()
+					except Exception as e:
+						self.state_error = str(e)
+				self.ready.set()
+				self._drain()
+				self._close()
+				for b in self.browsers.values():
+					try:
+						b.close()
+					except Exception:
+						pass
+				self.browsers = {}
+				self._playwright = None
+		except Exception as e:
+			self.error = str(e)
+			self.ready.set()
+		finally:
+			self._close()
+
+	def _launch(self, name: str):
+		return getattr(self._playwright, name).launch(headless=True)
+
+	def _browser(self, name: str):
+		# Runs on the pool thread: relaunch a crashed/disconnected browser, or drop it for good
+		if name in self.dropped or name not in self.browser_names:
+			raise BrowserPoolUnavailable(f"{name} is not in the browser pool")
+		browser = self.browsers.get(name)
+		if browser is not None and browser.is_connected():
+			return browser
+		try:
+			self.browsers[name] = self._launch(name)
+			self.relaunches += 1
+			return self.browsers[name]
+		except Exception as e:
+			self.browsers.pop(name, None)
+			self.dropped[name] = str(e)
+			raise BrowserPoolUnavailable(f"relaunching {name} failed: {e}")
+
+	def _drain(self):
+		while True:
+			job = self._jobs.get()
+			if job is None:
+				break
+			name, fn, fut = job
+			if not fut.set_running_or_notify_cancel():
+				continue
+			if self.error is not None:
+				fut.set_exception(BrowserPoolUnavailable(f"browser pool unavailable: {self.error}"))
+				continue
+			try:
+				browser = self._browser(name)
+			except BrowserPoolUnavailable as e:
+				fut.set_exception(e)
+				continue
+			try:
+				fut.set_result(fn(browser))
+			except Exception as e:
+				fut.set_exception(e)
+
+	def _close(self):
+		# Fail anything still queued (jobs that arrived after the stop sentinel, or after a startup failure)
+		with self._lock:
+			self._closed = True
+		reason = f"browser pool unavailable: {self.error}" if self.error else "browser pool stopped"
+		while True:
+			try:
+				job = self._jobs.get_nowait()
+			except queue.Empty:
+				return
+			if job is not None and job[2].set_running_or_notify_cancel():
+				job[2].set_exception(BrowserPoolUnavailable(reason))
+
+	def _install_state(self):
+		# Visit the target once and persist cookies/localStorage so every case context starts from it
+		Path(self.storage_state_path).unlink(missing_ok=True)  # never reuse a previous boot's state
+		if not self.browsers:
+			raise RuntimeError("no pre-warmed browser launched")
+		name = next(iter(self.browsers))
+		context = self.browsers[name].new_context()
+		try:
+			context.set_default_navigation_timeout(DEFAULT_NAV_TIMEOUT_MS)
+			context.set_default_timeout(DEFAULT_ACTION_TIMEOUT_MS)
+			page = context.new_page()
+			page.goto(self.target_url, wait_until="load")
+			state_dir = Path(self.storage_state_path).parent
+			os.makedirs(state_dir, exist_ok=True)
+			ExecutorAgent(name, str(state_dir), target_url=self.target_url)._select_language(page, [])
+			context.storage_state(path=self.storage_state_path)
+		finally:
+			context.close()
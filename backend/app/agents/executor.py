@@ -2,20 +2,25 @@ import os
 import json
 import time
 import uuid
+from contextlib import nullcontext
 from pathlib import Path
 from typing import List, Dict, Optional
 
-TARGET_URL = "https://play.ezygamers.com/"
+TARGET_URL = os.getenv("TARGET_URL", "https://play.ezygamers.com/")
 NEW_GAME_XPATH = "xpath=/html/body/div[1]/div[4]/button[2]"
 DEFAULT_NAV_TIMEOUT_MS = int(os.getenv("PAGE_NAV_TIMEOUT_MS", "15000"))
 DEFAULT_ACTION_TIMEOUT_MS = int(os.getenv("PAGE_ACTION_TIMEOUT_MS", "10000"))
+# How long a cold run waits for the browser pool's warm-up before starting without saved state
+STATE_WAIT_S = float(os.getenv("POOL_STATE_WAIT_S", "120"))
 
 class ExecutorAgent:
-	def __init__(self, browser_name: str, artifacts_dir: str):
+	def __init__(self, browser_name: str, artifacts_dir: str, target_url: Optional[str] = None):
 		self.browser_name = browser_name
 		self.artifacts_dir = Path(artifacts_dir)
+		self.target_url = target_url or TARGET_URL
 
-	def run_test(self, test_case: dict, run_id: str) -> Dict:
+	def run_test(self, test_case: dict, run_id: str, browser=None, storage_state: Optional[str] = None) -> Dict:
+		# browser: an already-launched (pre-warmed) browser to reuse; it is left open afterwards
 		from playwright.sync_api import sync_playwright
 
 		case_id = test_case.get("id", str(uuid.uuid4()))
@@ -28,13 +33,14 @@ class ExecutorAgent:
 
 		result = {"status": "unknown", "details": ""}
 
-		with sync_playwright() as p:
-			browser = None
+		owns_browser = browser is None
+		with (sync_playwright() if owns_browser else nullcontext()) as p:
 			context = None
 			page = None
 			try:
-				browser = getattr(p, self.browser_name).launch(headless=True)
-				context = browser.new_context(record_har_path=str(case_dir / "network.har"))
+				if owns_browser:
+					browser = getattr(p, self.browser_name).launch(headless=True)
+				context = browser.new_context(record_har_path=str(case_dir / "network.har"), storage_state=storage_state)
 				context.set_default_navigation_timeout(DEFAULT_NAV_TIMEOUT_MS)
 				context.set_default_timeout(DEFAULT_ACTION_TIMEOUT_MS)
 				page = context.new_page()
@@ -48,8 +54,8 @@ class ExecutorAgent:
 				page.on("requestfinished", lambda request: network_events.append({"url": request.url}))
 
 				# 1) Navigate
-				page.goto(TARGET_URL, wait_until="load")
-				self._log(step_logs, "navigate", "ok", TARGET_URL)
+				page.goto(self.target_url, wait_until="load")
+				self._log(step_logs, "navigate", "ok", self.target_url)
 
 				# 2) Language selection (best-effort)
 				self._select_language(page, step_logs)
@@ -96,7 +102,7 @@ class ExecutorAgent:
 					self._log(step_logs, "artifact", "error", str(ae))
 				try:
 					if context: context.close()
-					if browser: browser.close()
+					if browser and owns_browser: browser.close()
 				except Exception:
 					pass
 
@@ -107,6 +113,7 @@ class ExecutorAgent:
 		return {
 			"case_id": case_id,
 			"browser": self.browser_name,
+			"target_url": self.target_url,
 			"result": result,
 			"artifacts": {
 				"screenshot": str(case_dir / "final.png"),
@@ -222,8 +229,9 @@ class ExecutorAgent:
 		return False
 
 class OrchestratorAgent:
-	def __init__(self, artifacts_dir: str, browsers: List[str] | None = None, max_cases: int | None = None):
+	def __init__(self, artifacts_dir: str, browsers: List[str] | None = None, max_cases: int | None = None, pool=None):
 		self.artifacts_dir = Path(artifacts_dir)
+		self.pool = pool
 		self.browsers = browsers or [b.strip() for b in os.getenv("TEST_BROWSERS", "chromium").split(",") if b.strip()]
 		self.max_cases = max_cases or int(os.getenv("MAX_EXECUTE_CASES", "10"))
 
@@ -236,7 +244,30 @@ class OrchestratorAgent:
 		results: List[dict] = []
 		for case in cases:
 			for ex in executors:
-				res = ex.run_test(case, run_id)
+				res = self._run_case(ex, case, run_id)
 				results.append(res)
 		(run_dir / "results.json").write_text(json.dumps(results, indent=2))
 		return run_id
+
+	def _run_case(self, ex: ExecutorAgent, case: dict, run_id: str) -> Dict:
+		# Saved storage state applies to every run, pooled or cold, so results stay comparable.
+		# Pooled jobs resolve it on the pool thread, which only runs them after warm-up.
+		if self.pool is not None and self.pool.has(ex.browser_name):
+			from .browser_pool import BrowserPoolUnavailable
+			try:
+				return self.pool.run(ex.browser_name, lambda browser: ex.run_test(
+					case, run_id, browser=browser, storage_state=self.pool.storage_state()))
+			except BrowserPoolUnavailable as e:
+				# The case never ran on the pool, so a cold launch does not repeat it
+				print(f"Browser pool unavailable for {ex.browser_name}, launching cold: {e}")
+			except Exception as e:
+				print(f"Pooled run of {case.get('id')} on {ex.browser_name} failed: {e}")
+				return {
+					"case_id": case.get("id", str(uuid.uuid4())),
+					"browser": ex.browser_name,
+					"target_url": ex.target_url,
+					"result": {"status": "error", "details": f"browser pool: {e}"},
+					"artifacts": {},
+				}
+		storage_state = self.pool.storage_state(wait=STATE_WAIT_S) if self.pool is not None else None
+		return ex.run_test(case, run_id, storage_state=storage_state)
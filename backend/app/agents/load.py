@@ -0,0 +1,309 @@
+import os
+import json
+import time
+import threading
+import uuid
+from pathlib import Path
+from urllib.parse import urlparse
+from typing import Callable, Dict, List, Optional
+
+from .executor import ExecutorAgent, DEFAULT_NAV_TIMEOUT_MS, DEFAULT_ACTION_TIMEOUT_MS
+
+LAUNCH_TIMEOUT_S = float(os.getenv("LOAD_LAUNCH_TIMEOUT_S", "60"))
+# Every player is a headless browser on this host, so requests are capped server-side
+MAX_PLAYERS = int(os.getenv("LOAD_MAX_PLAYERS", "50"))
+MAX_ITERATIONS = int(os.getenv("LOAD_MAX_ITERATIONS", "20"))
+BROWSERS = {"chromium", "firefox", "webkit"}
+
+# Installed before any page script runs so long tasks from startup are captured too.
+PERF_INIT_SCRIPT = """
+(() => {
+  window.__longTasks = [];
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) {
+        window.__longTasks.push({name: e.name, start: e.startTime, duration: e.duration});
+      }
+    }).observe({type: 'longtask', buffered: true});
+  } catch (e) {}
+})();
+"""
+
+PERF_COLLECT_SCRIPT = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const resources = performance.getEntriesByType('resource').map(r => ({
+    name: r.name, initiator: r.initiatorType, start: r.startTime,
+    duration: r.duration, transfer_size: r.transferSize || 0,
+  }));
+  return {navigation: nav ? nav.toJSON() : null, resources, long_tasks: window.__longTasks || []};
+}
+"""
+
+
+def percentile(values: List[float], q: float) -> float:
+	# Linear interpolation between closest ranks; q in [0, 100]
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	pos = (len(ordered) - 1) * q / 100.0
+	lo = int(pos)
+	hi = min(lo + 1, len(ordered) - 1)
+	return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize(values: List[float]) -> Dict:
+	if not values:
+		return {"count": 0}
+	return {
+		"count": len(values),
+		"mean": round(sum(values) / len(values), 2),
+		"p50": round(percentile(values, 50), 2),
+		"p95": round(percentile(values, 95), 2),
+		"p99": round(percentile(values, 99), 2),
+		"max": round(max(values), 2),
+	}
+
+
+def validate_load_request(players: Optional[int] = None, iterations: Optional[int] = None,
+		browser: Optional[str] = None, target_url: Optional[str] = None):
+	"""Raise ValueError for load parameters outside the server-side limits."""
+	if players is not None and not 1 <= players <= MAX_PLAYERS:
+		raise ValueError(f"players must be between 1 and {MAX_PLAYERS}")
+	if iterations is not None and not 1 <= iterations <= MAX_ITERATIONS:
+		raise ValueError(f"iterations must be between 1 and {MAX_ITERATIONS}")
+	if browser is not None and browser not in BROWSERS:
+		raise ValueError(f"browser must be one of {sorted(BROWSERS)}")
+	if target_url is not None:
+		parsed = urlparse(target_url)
+		if parsed.scheme not in ("http", "https") or not parsed.netloc:
+			raise ValueError("target_url must be an http(s) URL")
+
+
+class SimulatedPlayerAgent(ExecutorAgent):
+	"""One simulated player: replays the new-game + tile-click flow and records client-side timings."""
+
+	def __init__(self, player_id: str, browser_name: str, artifacts_dir: str, target_url: Optional[str] = None):
+		super().__init__(browser_name, artifacts_dir, target_url=target_url)
+		self.player_id = player_id
+
+	def run_session(self, run_id: str, iterations: int, ready: Optional[threading.Semaphore] = None,
+			start_event: Optional[threading.Event] = None) -> Dict:
+		# `ready` is released exactly once per player, whether or not the browser came up
+		signalled = False
+
+		def _signal_ready():
+			nonlocal signalled
+			if ready is not None and not signalled:
+				signalled = True
+				ready.release()
+
+		try:
+			return self._play(run_id, iterations, _signal_ready, start_event)
+		finally:
+			_signal_ready()
+
+	def _play(self, run_id: str, iterations: int, signal_ready: Callable[[], None],
+			start_event: Optional[threading.Event]) -> Dict:
+		from playwright.sync_api import sync_playwright
+
+		player_dir = self.artifacts_dir / run_id / "load" / self.player_id
+		os.makedirs(player_dir, exist_ok=True)
+
+		step_logs: List[dict] = []
+		actions: List[dict] = []
+		perf: List[dict] = []
+		errors: List[str] = []
+		completed = 0
+
+		def _navigate() -> bool:
+			page.goto(self.target_url, wait_until="load")
+			return True
+
+		with sync_playwright() as p:
+			browser = None
+			context = None
+			try:
+				browser = getattr(p, self.browser_name).launch(headless=True)
+				context = browser.new_context()
+				context.set_default_navigation_timeout(DEFAULT_NAV_TIMEOUT_MS)
+				context.set_default_timeout(DEFAULT_ACTION_TIMEOUT_MS)
+				context.add_init_script(PERF_INIT_SCRIPT)
+				page = context.new_page()
+				# Browser launch is not part of the measured load; wait until every player is ready
+				signal_ready()
+				if start_event is not None:
+					start_event.wait()
+				for i in range(iterations):
+					try:
+						self._timed(actions, i, "navigate", _navigate)
+						self._select_language(page, step_logs)
+						if not self._timed(actions, i, "start_new_game", lambda: self._start_new_game(page, step_logs)):
+							raise RuntimeError("start new game failed")
+						if not self._timed(actions, i, "wait_for_board", lambda: self._wait_for_board(page, step_logs)):
+							raise RuntimeError("board not visible")
+						if not self._timed(actions, i, "click_two_tiles_sum", lambda: self._click_two_tiles_sum(page, 10, step_logs)):
+							raise RuntimeError("no sum-10 pair found")
+						completed += 1
+					except Exception as e:
+						errors.append(f"iteration {i}: {e}")
+						self._log(step_logs, "iteration", "error", str(e))
+					finally:
+						# Each navigation resets the performance timeline, so collect per iteration
+						try:
+							entry = page.evaluate(PERF_COLLECT_SCRIPT)
+							entry["iteration"] = i
+							perf.append(entry)
+						except Exception as pe:
+							self._log(step_logs, "perf", "error", str(pe))
+			except Exception as e:
+				errors.append(str(e))
+			finally:
+				try:
+					if context: context.close()
+					if browser: browser.close()
+				except Exception:
+					pass
+
+		(player_dir / "log.json").write_text(json.dumps(step_logs, indent=2))
+		(player_dir / "perf.json").write_text(json.dumps(perf, indent=2))
+
+		return {
+			"player_id": self.player_id,
+			"browser": self.browser_name,
+			"iterations": iterations,
+			"completed": completed,
+			"errors": errors,
+			"actions": actions,
+			"perf": perf,
+		}
+
+	def _timed(self, actions: List[dict], iteration: int, name: str, fn: Callable[[], bool]) -> bool:
+		t0 = time.perf_counter()
+		ok = False
+		try:
+			ok = bool(fn())
+			return ok
+		finally:
+			actions.append({
+				"iteration": iteration,
+				"action": name,
+				"ok": ok,
+				"latency_ms": round((time.perf_counter() - t0) * 1000, 2),
+			})
+
+
+class LoadTesterAgent:
+	def __init__(self, artifacts_dir: str, players: int | None = None, iterations: int | None = None,
+			browser: str | None = None, target_url: str | None = None):
+		self.artifacts_dir = Path(artifacts_dir)
+		self.players = min(players or int(os.getenv("LOAD_PLAYERS", "5")), MAX_PLAYERS)
+		self.iterations = min(iterations or int(os.getenv("LOAD_ITERATIONS", "3")), MAX_ITERATIONS)
+		self.browser = browser or os.getenv("TEST_BROWSERS", "chromium").split(",")[0].strip() or "chromium"
+		self.target_url = target_url
+
+	def run_load(self, run_id: str | None = None) -> str:
+		run_id = run_id or (time.strftime("%Y%m%d-%H%M%S") + f"-load-{uuid.uuid4().hex[:6]}")
+		run_dir = self.artifacts_dir / run_id
+		os.makedirs(run_dir, exist_ok=True)
+
+		ready = threading.Semaphore(0)
+		start_event = threading.Event()
+		sessions: List[Optional[dict]] = [None] * self.players
+		agents = [
+			SimulatedPlayerAgent(f"player-{i + 1:03d}", self.browser, str(self.artifacts_dir), target_url=self.target_url)
+			for i in range(self.players)
+		]
+
+		def _worker(idx: int):
+			agent = agents[idx]
+			try:
+				sessions[idx] = agent.run_session(run_id, self.iterations, ready, start_event)
+			except Exception as e:
+				sessions[idx] = {"player_id": agent.player_id, "browser": agent.browser_name, "iterations": self.iterations,
+					"completed": 0, "errors": [str(e)], "actions": [], "perf": []}
+
+		threads = [threading.Thread(target=_worker, args=(i,), daemon=True) for i in range(self.players)]
+		for t in threads:
+			t.start()
+		# Browser launches are excluded from the measurement: start the clock once every player is ready
+		deadline = time.monotonic() + LAUNCH_TIMEOUT_S
+		for _ in range(self.players):
+			if not ready.acquire(timeout=max(0.0, deadline - time.monotonic())):
+				break
+		t0 = time.perf_counter()
+		start_event.set()
+		for t in threads:
+			t.join()
+		wall_s = time.perf_counter() - t0
+
+		players = [s for s in sessions if s is not None]
+		load = {
+			"run_id": run_id,
+			"config": {
+				"players": self.players,
+				"iterations": self.iterations,
+				"browser": self.browser,
+				"target_url": agents[0].target_url if agents else self.target_url,
+			},
+			"aggregate": self.aggregate(players, wall_s),
+			"players": [{k: v for k, v in s.items() if k != "perf"} for s in players],
+		}
+		(run_dir / "load.json").write_text(json.dumps(load, indent=2))
+		return run_id
+
+	def aggregate(self, players: List[dict], wall_s: float) -> Dict:
+		all_actions = [a for s in players for a in s.get("actions", [])]
+		ok_actions = [a for a in all_actions if a["ok"]]
+		by_action: Dict[str, List[float]] = {}
+		for a in ok_actions:
+			by_action.setdefault(a["action"], []).append(a["latency_ms"])
+
+		ttfb, dcl, load_evt, res_durations, long_tasks = [], [], [], [], []
+		resource_count = 0
+		transfer_bytes = 0
+		for s in players:
+			for entry in s.get("perf", []):
+				nav = entry.get("navigation") or {}
+				if nav:
+					ttfb.append(nav.get("responseStart", 0) - nav.get("requestStart", 0))
+					dcl.append(nav.get("domContentLoadedEventEnd", 0) - nav.get("startTime", 0))
+					load_evt.append(nav.get("loadEventEnd", 0) - nav.get("startTime", 0))
+				for r in entry.get("resources", []):
+					resource_count += 1
+					transfer_bytes += r.get("transfer_size", 0)
+					res_durations.append(r.get("duration", 0))
+				long_tasks.extend(t.get("duration", 0) for t in entry.get("long_tasks", []))
+
+		sessions = sum(s.get("completed", 0) for s in players)
+		return {
+			"wall_time_s": round(wall_s, 3),
+			"sessions_completed": sessions,
+			"sessions_attempted": sum(s.get("iterations", 0) for s in players),
+			"actions_total": len(all_actions),
+			"actions_failed": len(all_actions) - len(ok_actions),
+			"throughput": {
+				"sessions_per_s": round(sessions / wall_s, 3) if wall_s > 0 else 0.0,
+				"actions_per_s": round(len(ok_actions) / wall_s, 3) if wall_s > 0 else 0.0,
+			},
+			"latency_ms": {
+				"all_actions": summarize([a["latency_ms"] for a in ok_actions]),
+				"by_action": {name: summarize(vals) for name, vals in by_action.items()},
+			},
+			"navigation_ms": {
+				"ttfb": summarize(ttfb),
+				"dom_content_loaded": summarize(dcl),
+				"load": summarize(load_evt),
+			},
+			"resources": {
+				"count": resource_count,
+				"transfer_bytes": transfer_bytes,
+				"duration_ms": summarize(res_durations),
+			},
+			"long_tasks": {
+				"count": len(long_tasks),
+				"total_ms": round(sum(long_tasks), 2),
+				"duration_ms": summarize(long_tasks),
+			},
+			"errors": [e for s in players for e in s.get("errors", [])][:50],
+		}
@@ -1,18 +1,14 @@
 import os
 from typing import List, Optional
 
-try:
-    from langchain_openai import ChatOpenAI
-    exists_openai = True
-except Exception:
-    exists_openai = False
-
 class PlannerAgent:
     def __init__(self, openai_api_key: Optional[str] = None, use_llm: bool = False):
-        self.use_llm = use_llm and exists_openai and openai_api_key is not None
+        self.use_llm = use_llm and openai_api_key is not None
         self.llm = None
         if self.use_llm:
+            # Imported lazily: the langchain chain is heavy and only needed when USE_LLM is enabled
             try:
+                from langchain_openai import ChatOpenAI
                 self.llm = ChatOpenAI(
                     api_key=openai_api_key,
                     model="gpt-4o-mini",
@@ -0,0 +1,315 @@
+import os
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+from PIL import Image
+
+from .executor import TARGET_URL
+
+# Screenshots are compared as grayscale thumbnails; the pHash works on a further 4x block-mean reduction
+DIFF_SIZE = 128
+HASH_SIZE = 32
+HASH_LOW = 8
+PIXEL_DELTA = 24  # per-pixel grey-level change (0-255) that counts as "changed"
+# The game deals random tiles every time, so digits always differ a little; the defaults only flag
+# layout-level changes (wrong screen, missing board, blank canvas, ...)
+HASH_THRESHOLD = int(os.getenv("VISUAL_HASH_THRESHOLD", "16"))
+MEAN_DIFF_THRESHOLD = float(os.getenv("VISUAL_MEAN_DIFF_THRESHOLD", "0.08"))
+CLUSTER_THRESHOLD = int(os.getenv("VISUAL_CLUSTER_THRESHOLD", "8"))
+# Off by default: a first screenshot is only adopted as an (unreviewed) baseline when asked to
+AUTO_BASELINE = os.getenv("VISUAL_AUTO_BASELINE", "false").lower() == "true"
+
+# visual_index.json is rewritten by concurrent background runs and /analyze calls
+_INDEX_LOCK = threading.Lock()
+
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+	k = np.arange(n)[:, None]
+	i = np.arange(n)[None, :]
+	m = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+	m[0, :] /= np.sqrt(2.0)
+	return m.astype(np.float32)
+
+
+_DCT = _dct_matrix(HASH_SIZE)
+
+
+def load_thumbnail(path: Optional[str]) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+	if not path or not Path(path).exists():
+		return None
+	try:
+		with Image.open(path) as img:
+			size = img.size
+			if img.mode not in ("L", "RGB", "RGBA"):
+				img = img.convert("RGB")
+			# reduce() is a cheap box filter; it keeps resize() from touching every full-page pixel
+			factor = max(1, min(size) // (DIFF_SIZE * 2))
+			if factor > 1:
+				img = img.reduce(factor)
+			thumb = img.convert("L").resize((DIFF_SIZE, DIFF_SIZE), Image.BILINEAR)
+			return np.asarray(thumb, dtype=np.uint8), size
+	except Exception:
+		return None
+
+
+def target_key(target_url: Optional[str]) -> str:
+	"""Directory name for a target, so baselines from the stand-in page never meet the real game."""
+	parsed = urlparse(target_url or TARGET_URL)
+	key = parsed.netloc or f"{parsed.scheme or 'local'}-{Path(parsed.path).parent.name or 'root'}"
+	return "".join(ch if ch.isalnum() or ch in ".-" else "_" for ch in key)
+
+
+def _cache_path(png: Path) -> Path:
+	return png.with_suffix(".npz")
+
+
+def save_thumbnail_cache(png: Path, thumb: Tuple[np.ndarray, Tuple[int, int]]):
+	np.savez(_cache_path(png), thumb=thumb[0], size=np.array(thumb[1]))
+
+
+def load_baseline(path: Path) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+	# Baselines are decoded once; later runs read the cached thumbnail instead of the full PNG
+	cache = _cache_path(path)
+	if cache.exists() and path.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+		try:
+			with np.load(cache) as z:
+				return z["thumb"], tuple(int(v) for v in z["size"])
+		except Exception:
+			pass
+	thumb = load_thumbnail(str(path))
+	if thumb is not None:
+		try:
+			save_thumbnail_cache(path, thumb)
+		except Exception:
+			pass
+	return thumb
+
+
+def phash(stack: np.ndarray) -> np.ndarray:
+	"""Perceptual hashes for a (N, DIFF_SIZE, DIFF_SIZE) stack, packed as (N, 8) uint8."""
+	n = stack.shape[0]
+	f = DIFF_SIZE // HASH_SIZE
+	small = stack.astype(np.float32).reshape(n, HASH_SIZE, f, HASH_SIZE, f).mean(axis=(2, 4))
+	coeffs = (_DCT @ small @ _DCT.T)[:, :HASH_LOW, :HASH_LOW].reshape(n, -1)
+	median = np.median(coeffs[:, 1:], axis=1, keepdims=True)
+	return np.packbits(coeffs > median, axis=1)
+
+
+def hamming(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+	"""Pairwise Hamming distances between packed hashes: (N, 8) x (M, 8) -> (N, M)."""
+	return _POPCOUNT[a[:, None, :] ^ b[None, :, :]].sum(axis=-1, dtype=np.int32)
+
+
+class VisualRegressionAgent:
+	def __init__(self, data_dir: str):
+		self.baselines_dir = Path(data_dir) / "baselines"
+		self.index_path = Path(data_dir) / "visual_index.json"
+
+	def baseline_path(self, case_id: str, browser: str, target_url: Optional[str] = None) -> Path:
+		return self.baselines_dir / target_key(target_url) / case_id / f"{browser}.png"
+
+	def baseline_meta(self, baseline: Path) -> Dict:
+		meta = baseline.with_suffix(".json")
+		if meta.exists():
+			try:
+				return json.loads(meta.read_text())
+			except Exception:
+				pass
+		return {}
+
+	def _store_baseline(self, screenshot: str, dest: Path, target_url: Optional[str], run_id: str, reviewed: bool):
+		os.makedirs(dest.parent, exist_ok=True)
+		shutil.copyfile(screenshot, dest)
+		_cache_path(dest).unlink(missing_ok=True)
+		dest.with_suffix(".json").write_text(json.dumps({
+			"target_url": target_url or TARGET_URL,
+			"run_id": run_id,
+			"reviewed": reviewed,
+		}, indent=2))
+
+	def compare_run(self, run_id: str, results: List[dict]) -> Dict:
+		t0 = time.perf_counter()
+		entries: List[dict] = []
+		for r in results:
+			entries.append({
+				"case_id": r["case_id"],
+				"browser": r["browser"],
+				"status": r.get("result", {}).get("status"),
+				"screenshot": r.get("artifacts", {}).get("screenshot"),
+				"target_url": r.get("target_url") or TARGET_URL,
+			})
+		baselines = [self.baseline_path(e["case_id"], e["browser"], e["target_url"]) for e in entries]
+
+		# PNG decoding releases the GIL, so threads decode the whole run in parallel
+		with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2)) as pool:
+			current = list(pool.map(load_thumbnail, [e["screenshot"] for e in entries]))
+			base = list(pool.map(load_baseline, baselines))
+
+		have = [i for i, c in enumerate(current) if c is not None]
+		hashes: Dict[int, np.ndarray] = {}
+		if have:
+			cur_stack = np.stack([current[i][0] for i in have])
+			for i, h in zip(have, phash(cur_stack)):
+				hashes[i] = h
+
+		both = [i for i in have if base[i] is not None]
+		if both:
+			a = np.stack([current[i][0] for i in both]).astype(np.int16)
+			b = np.stack([base[i][0] for i in both]).astype(np.int16)
+			diff = np.abs(a - b)
+			mean_diff = diff.mean(axis=(1, 2)) / 255.0
+			changed_ratio = (diff > PIXEL_DELTA).mean(axis=(1, 2))
+			base_hashes = phash(b.astype(np.uint8))
+			hash_dist = _POPCOUNT[np.stack([hashes[i] for i in both]) ^ base_hashes].sum(axis=-1, dtype=np.int32)
+			for j, i in enumerate(both):
+				# Thumbnails squash every page to the same square, so a page-height change is checked separately
+				size_changed = current[i][1] != base[i][1]
+				changed = bool(hash_dist[j] > HASH_THRESHOLD or mean_diff[j] > MEAN_DIFF_THRESHOLD or size_changed)
+				reviewed = self.baseline_meta(baselines[i]).get("reviewed", True)
+				if not changed:
+					verdict = "match"
+				else:
+					# Differences from an auto-adopted baseline are reported but do not fail the case
+					verdict = "changed" if reviewed else "changed_unreviewed"
+				entries[i].update({
+					"visual": verdict,
+					"baseline_reviewed": reviewed,
+					"mean_diff": round(float(mean_diff[j]), 4),
+					"changed_ratio": round(float(changed_ratio[j]), 4),
+					"hash_distance": int(hash_dist[j]),
+					"size_changed": size_changed,
+				})
+				if changed:
+					entries[i]["diff_image"] = self._write_diff(entries[i]["screenshot"], diff[j])
+
+		for i, e in enumerate(entries):
+			if "visual" in e:
+				continue
+			if current[i] is None:
+				e["visual"] = "missing"
+			elif AUTO_BASELINE and e["status"] == "completed":
+				self._store_baseline(e["screenshot"], baselines[i], e["target_url"], run_id, reviewed=False)
+				save_thumbnail_cache(baselines[i], current[i])
+				e["visual"] = "new_baseline"
+				e["baseline_reviewed"] = False
+			else:
+				e["visual"] = "no_baseline"
+
+		for i, h in hashes.items():
+			entries[i]["phash"] = h.tobytes().hex()
+		failures = [i for i in hashes if entries[i]["visual"] == "changed" or entries[i]["status"] == "error"]
+		clusters = self._cluster(run_id, [entries[i] for i in failures])
+
+		summary = {k: sum(1 for e in entries if e["visual"] == k)
+			for k in ["match", "changed", "changed_unreviewed", "new_baseline", "no_baseline", "missing"]}
+		summary["compared"] = len(both)
+		for e in entries:
+			e.pop("screenshot", None)
+		return {
+			"summary": summary,
+			"thresholds": {"hash": HASH_THRESHOLD, "mean_diff": MEAN_DIFF_THRESHOLD, "cluster": CLUSTER_THRESHOLD},
+			"auto_baseline": AUTO_BASELINE,
+			"results": entries,
+			"clusters": clusters,
+			"elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+		}
+
+	def promote_run(self, run_id: str, artifacts_dir: str, case_id: Optional[str] = None) -> int:
+		# Accept a run's screenshots as the new baselines (e.g. after an intended UI change)
+		results_file = Path(artifacts_dir) / run_id / "results.json"
+		if not results_file.exists():
+			return 0
+		promoted = 0
+		for r in json.loads(results_file.read_text()):
+			if case_id and r["case_id"] != case_id:
+				continue
+			# Error-screen renders would turn every later correct render into a "regression";
+			# a failed case is only promoted when it is named explicitly
+			if not case_id and r.get("result", {}).get("status") != "completed":
+				continue
+			shot = r.get("artifacts", {}).get("screenshot")
+			if not shot or not Path(shot).exists():
+				continue
+			dest = self.baseline_path(r["case_id"], r["browser"], r.get("target_url"))
+			self._store_baseline(shot, dest, r.get("target_url"), run_id, reviewed=True)
+			promoted += 1
+		return promoted
+
+	def _write_diff(self, screenshot: str, diff: np.ndarray) -> Optional[str]:
+		out = Path(screenshot).with_name("visual_diff.png")
+		try:
+			img = Image.fromarray(np.clip(diff * 4, 0, 255).astype(np.uint8))
+			img.resize((DIFF_SIZE * 4, DIFF_SIZE * 4), Image.NEAREST).save(out)
+			return str(out)
+		except Exception:
+			return None
+
+	def _cluster(self, run_id: str, failures: List[dict]) -> List[dict]:
+		# Leader clustering over a persistent index: each cluster keeps the hash of its first member,
+		# so the same visual failure in later runs lands in the same cluster id.
+		with _INDEX_LOCK:
+			index = self._update_index(run_id, failures)
+
+		by_id = {c["id"]: c for c in index["clusters"]}
+		touched: Dict[str, List[dict]] = {}
+		for f in failures:
+			touched.setdefault(f["cluster"], []).append(f)
+		out = []
+		for cid, members in touched.items():
+			c = by_id[cid]
+			out.append({
+				"cluster_id": cid,
+				"size_in_run": len(members),
+				"total_size": len(c["members"]),
+				"runs": len({m["run_id"] for m in c["members"]}),
+				"first_seen": c["first_seen"],
+				"members": [f"{m['case_id']}/{m['browser']}" for m in members],
+			})
+		return sorted(out, key=lambda c: c["size_in_run"], reverse=True)
+
+	def _update_index(self, run_id: str, failures: List[dict]) -> Dict:
+		index = self._load_index()
+		clusters = index["clusters"]
+		for c in clusters:
+			c["members"] = [m for m in c["members"] if m["run_id"] != run_id]  # re-analysis is idempotent
+
+		reps = np.array([list(bytes.fromhex(c["hash"])) for c in clusters], dtype=np.uint8).reshape(-1, 8)
+		for f in failures:
+			h = np.frombuffer(bytes.fromhex(f["phash"]), dtype=np.uint8)[None, :]
+			cluster = None
+			if len(reps):
+				dist = hamming(h, reps)[0]
+				best = int(dist.argmin())
+				if dist[best] <= CLUSTER_THRESHOLD:
+					cluster = clusters[best]
+			if cluster is None:
+				cluster = {"id": f"VC{index['next_id']:04d}", "hash": f["phash"], "first_seen": run_id, "members": []}
+				index["next_id"] += 1
+				clusters.append(cluster)
+				reps = np.vstack([reps, h])
+			member = {"run_id": run_id, "case_id": f["case_id"], "browser": f["browser"]}
+			cluster["members"].append(member)
+			cluster["last_seen"] = run_id
+			f["cluster"] = cluster["id"]
+
+		index["clusters"] = [c for c in clusters if c["members"]]
+		os.makedirs(self.index_path.parent, exist_ok=True)
+		self.index_path.write_text(json.dumps(index, indent=2))
+		return index
+
+	def _load_index(self) -> Dict:
+		if self.index_path.exists():
+			try:
+				return json.loads(self.index_path.read_text())
+			except Exception:
+				pass
+		return {"next_id": 1, "clusters": []}
@@ -1,6 +1,7 @@
 import os
 import json
 import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,8 +13,11 @@ from .agents.planner import PlannerAgent
 from .agents.ranker import RankerAgent
 from .agents.executor import OrchestratorAgent
 from .agents.analyzer import AnalyzerAgent
+from .agents.load import LoadTesterAgent, validate_load_request
+from .agents.browser_pool import BrowserPool
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# GAME_TESTER_HOME relocates data/, reports/ and artifacts/ (e.g. for benchmarks or tests)
+BASE_DIR = Path(os.getenv("GAME_TESTER_HOME") or Path(__file__).resolve().parent.parent.parent)
 DATA_DIR = BASE_DIR / "data"
 REPORTS_DIR = BASE_DIR / "reports"
 ARTIFACTS_DIR = BASE_DIR / "artifacts"
@@ -21,7 +25,25 @@ ARTIFACTS_DIR = BASE_DIR / "artifacts"
 for d in [DATA_DIR, REPORTS_DIR, ARTIFACTS_DIR]:
     os.makedirs(d, exist_ok=True)
 
-app = FastAPI(title="Multi-Agent Game Tester POC")
+# Optional warm start: PREWARM_BROWSERS=chromium,firefox launches those browsers at startup
+# and PREWARM_STATE=true saves the target's storage state for every case context to reuse.
+_browser_pool: Optional[BrowserPool] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _browser_pool
+    prewarm = [b.strip() for b in os.getenv("PREWARM_BROWSERS", "").split(",") if b.strip()]
+    if prewarm:
+        state_path = str(DATA_DIR / "storage_state.json") if os.getenv("PREWARM_STATE", "false").lower() == "true" else None
+        _browser_pool = BrowserPool(prewarm, storage_state_path=state_path)
+        # Warms up on its own thread so startup (and /health) is not blocked
+        _browser_pool.start()
+    yield
+    if _browser_pool is not None:
+        _browser_pool.stop()
+        _browser_pool = None
+
+app = FastAPI(title="Multi-Agent Game Tester POC", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -46,6 +68,12 @@ class ExecuteResponse(BaseModel):
     message: str
     run_id: str
 
+class LoadRequest(BaseModel):
+    players: Optional[int] = None
+    iterations: Optional[int] = None
+    browser: Optional[str] = None
+    target_url: Optional[str] = None
+
 class ReportResponse(BaseModel):
     report: dict
 
@@ -53,6 +81,12 @@ class ReportResponse(BaseModel):
 def health():
     return {"status": "ok"}
 
+@app.get("/warmup")
+def warmup():
+    if _browser_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **_browser_pool.status()}
+
 @app.post("/plan", response_model=PlanResponse)
 def plan():
     # Load OpenAI API key from environment variable
@@ -75,9 +109,9 @@ _status: dict[str, dict] = {}
 def _background_execute(run_id: str, test_cases: list, max_cases: Optional[int], browsers: Optional[List[str]]):
     try:
         _status[run_id] = {"state": "running"}
-        orchestrator = OrchestratorAgent(artifacts_dir=str(ARTIFACTS_DIR), browsers=browsers, max_cases=max_cases)
+        orchestrator = OrchestratorAgent(artifacts_dir=str(ARTIFACTS_DIR), browsers=browsers, max_cases=max_cases, pool=_browser_pool)
         orchestrator.run_tests(test_cases, run_id=run_id)
-        analyzer = AnalyzerAgent(reports_dir=str(REPORTS_DIR))
+        analyzer = AnalyzerAgent(reports_dir=str(REPORTS_DIR), data_dir=str(DATA_DIR))
         report = analyzer.analyze_run(run_id, artifacts_dir=str(ARTIFACTS_DIR))
         (REPORTS_DIR / f"report-{run_id}.json").write_text(json.dumps(report, indent=2))
         (REPORTS_DIR / "report.json").write_text(json.dumps(report, indent=2))
@@ -104,6 +138,35 @@ def execute(payload: ExecuteRequest | None = None):
     threading.Thread(target=_background_execute, args=(run_id, test_cases, max_cases, browsers), daemon=True).start()
     return {"message": "Execution started.", "run_id": run_id}
 
+def _background_load(run_id: str, players: Optional[int], iterations: Optional[int], browser: Optional[str], target_url: Optional[str]):
+    try:
+        _status[run_id] = {"state": "running", "mode": "load"}
+        tester = LoadTesterAgent(artifacts_dir=str(ARTIFACTS_DIR), players=players, iterations=iterations, browser=browser, target_url=target_url)
+        tester.run_load(run_id=run_id)
+        analyzer = AnalyzerAgent(reports_dir=str(REPORTS_DIR), data_dir=str(DATA_DIR))
+        report = analyzer.analyze_run(run_id, artifacts_dir=str(ARTIFACTS_DIR))
+        (REPORTS_DIR / f"report-{run_id}.json").write_text(json.dumps(report, indent=2))
+        (REPORTS_DIR / "report.json").write_text(json.dumps(report, indent=2))
+        _status[run_id] = {"state": "done", "mode": "load"}
+    except Exception as e:
+        _status[run_id] = {"state": "error", "mode": "load", "detail": str(e)}
+
+@app.post("/load", response_model=ExecuteResponse)
+def load(payload: LoadRequest | None = None):
+    # Load mode: N concurrent simulated players replaying the new-game + tile-click flow
+    payload = payload or LoadRequest()
+    try:
+        validate_load_request(payload.players, payload.iterations, payload.browser, payload.target_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    run_id = os.getenv("RUN_ID_OVERRIDE") or __import__("time").strftime("%Y%m%d-%H%M%S") + "-load"
+    threading.Thread(
+        target=_background_load,
+        args=(run_id, payload.players, payload.iterations, payload.browser, payload.target_url),
+        daemon=True,
+    ).start()
+    return {"message": "Load test started.", "run_id": run_id}
+
 @app.get("/status/{run_id}")
 def status(run_id: str):
     st = _status.get(run_id)
@@ -120,12 +183,21 @@ def analyze(run_id: str | None = None):
         if not runs:
             raise HTTPException(status_code=400, detail="No runs found to analyze.")
         run_id = runs[0].name
-    analyzer = AnalyzerAgent(reports_dir=str(REPORTS_DIR))
+    analyzer = AnalyzerAgent(reports_dir=str(REPORTS_DIR), data_dir=str(DATA_DIR))
     report = analyzer.analyze_run(run_id, artifacts_dir=str(ARTIFACTS_DIR))
     (REPORTS_DIR / f"report-{run_id}.json").write_text(json.dumps(report, indent=2))
     (REPORTS_DIR / "report.json").write_text(json.dumps(report, indent=2))
     return {"message": "Analysis complete", "run_id": run_id}
 
+@app.post("/baselines/{run_id}")
+def promote_baselines(run_id: str, case_id: str | None = None):
+    # Accept a run's screenshots as the visual regression baselines: its completed cases, or just case_id
+    from .agents.visual import VisualRegressionAgent
+    promoted = VisualRegressionAgent(str(DATA_DIR)).promote_run(run_id, str(ARTIFACTS_DIR), case_id=case_id)
+    if not promoted:
+        raise HTTPException(status_code=404, detail="No screenshots of completed cases found for that run.")
+    return {"message": "Baselines updated", "run_id": run_id, "promoted": promoted}
+
 @app.get("/report", response_model=ReportResponse)
 def report():
     report_file = REPORTS_DIR / "report.json"
@@ -0,0 +1,140 @@
+"""Startup-time benchmark for the backend.
+
+Measures, in fresh processes:
+  - import time of `app.main`
+  - time from server spawn to the first successful /health
+  - time from the first /execute to a completed case (1 case, 1 browser)
+
+The server runs with GAME_TESTER_HOME set to a throwaway directory, so the benchmark's plan,
+report, runs and visual index never touch the project's data/, reports/ or artifacts/.
+
+Examples (from the backend/ directory):
+  python bench_startup.py
+  python bench_startup.py --prewarm chromium
+  python bench_startup.py --prewarm chromium --target-url http://localhost:9000/index.html
+"""
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+IMPORT_SNIPPET = (
+	"import time; t0 = time.perf_counter(); import app.main; "
+	"print(time.perf_counter() - t0)"
+)
+
+
+def _free_port() -> int:
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		return s.getsockname()[1]
+
+
+def bench_import(runs: int, env: dict) -> dict:
+	samples = []
+	for _ in range(runs):
+		out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env,
+			capture_output=True, text=True, check=True)
+		samples.append(float(out.stdout.strip().splitlines()[-1]) * 1000)
+	return {"runs": runs, "min_ms": round(min(samples), 1), "median_ms": round(statistics.median(samples), 1)}
+
+
+def bench_server(env: dict, browser: str, skip_case: bool, timeout_s: float) -> dict:
+	port = _free_port()
+	base = f"http://127.0.0.1:{port}"
+	t0 = time.perf_counter()
+	proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+		cwd=BACKEND_DIR, env=env)
+	result: dict = {}
+	try:
+		with httpx.Client(timeout=5.0) as client:
+			while True:
+				if proc.poll() is not None:
+					raise RuntimeError(f"server exited with code {proc.returncode}")
+				try:
+					if client.get(f"{base}/health").status_code == 200:
+						break
+				except httpx.TransportError:
+					pass
+				if time.perf_counter() - t0 > timeout_s:
+					raise RuntimeError("server did not become healthy")
+				time.sleep(0.02)
+			result["first_health_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+			if skip_case:
+				return result
+
+			client.post(f"{base}/plan", timeout=60.0).raise_for_status()
+			t1 = time.perf_counter()
+			resp = client.post(f"{base}/execute", json={"max_cases": 1, "browsers": [browser]})
+			resp.raise_for_status()
+			run_id = resp.json()["run_id"]
+			while True:
+				st = client.get(f"{base}/status/{run_id}").json()
+				if st.get("state") in ("done", "error"):
+					break
+				if time.perf_counter() - t1 > timeout_s:
+					raise RuntimeError("case did not finish")
+				time.sleep(0.05)
+			result["first_case_ms"] = round((time.perf_counter() - t1) * 1000, 1)
+			result["first_case_since_spawn_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+			result["run_state"] = st.get("state")
+			tests = client.get(f"{base}/report").json().get("report", {}).get("tests", [])
+			if tests:
+				result["case_verdict"] = tests[0].get("verdict")
+			result["warmup"] = client.get(f"{base}/warmup").json()
+	finally:
+		proc.terminate()
+		try:
+			proc.wait(timeout=10)
+		except subprocess.TimeoutExpired:
+			proc.kill()
+	return result
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--runs", type=int, default=5, help="import-time samples")
+	parser.add_argument("--browser", default="chromium")
+	parser.add_argument("--prewarm", default="", help="value for PREWARM_BROWSERS, e.g. chromium")
+	parser.add_argument("--prewarm-state", action="store_true", help="set PREWARM_STATE=true")
+	parser.add_argument("--target-url", default=None, help="override TARGET_URL (e.g. the local stand-in page)")
+	parser.add_argument("--skip-case", action="store_true", help="only measure import and /health")
+	parser.add_argument("--timeout", type=float, default=180.0)
+	parser.add_argument("--home", default=None, help="GAME_TESTER_HOME for the server (default: a temp dir, removed afterwards)")
+	args = parser.parse_args()
+
+	env = dict(os.environ)
+	env["PREWARM_BROWSERS"] = args.prewarm
+	env["PREWARM_STATE"] = "true" if args.prewarm_state else "false"
+	if args.target_url:
+		env["TARGET_URL"] = args.target_url
+	home = args.home or tempfile.mkdtemp(prefix="game-tester-bench-")
+	env["GAME_TESTER_HOME"] = home
+
+	try:
+		report = {
+			"python": sys.version.split()[0],
+			"prewarm": args.prewarm or None,
+			"home": home,
+			"import": bench_import(args.runs, env),
+			"server": bench_server(env, args.browser, args.skip_case, args.timeout),
+		}
+	finally:
+		if args.home is None:
+			shutil.rmtree(home, ignore_errors=True)
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,32 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+STAND_IN_PAGE = BACKEND_DIR / "stand_in" / "index.html"
+
+# Set on hosts that have Playwright's Chromium (e.g. CI) so a broken install fails instead of skipping
+REQUIRE_BROWSER_TESTS = os.getenv("REQUIRE_BROWSER_TESTS", "false").lower() in ("1", "true", "yes")
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session")
+def chromium_available():
+	# Browser-driven tests run against the local stand-in page; skip when no browser is installed
+	try:
+		from playwright.sync_api import sync_playwright
+		with sync_playwright() as p:
+			p.chromium.launch(headless=True).close()
+	except Exception as e:
+		if REQUIRE_BROWSER_TESTS:
+			pytest.fail(f"chromium not available but REQUIRE_BROWSER_TESTS is set: {e}")
+		pytest.skip(f"chromium not available: {e}")
+	return True
+
+
+@pytest.fixture
+def stand_in_url():
+	return STAND_IN_PAGE.as_uri()
@@ -0,0 +1,228 @@
+import sys
+import types
+import threading
+
+import pytest
+
+from app.agents.browser_pool import BrowserPool, BrowserPoolUnavailable
+from app.agents.executor import ExecutorAgent, OrchestratorAgent
+
+
+class FakeBrowser:
+	def __init__(self):
+		self.connected = True
+
+	def is_connected(self):
+		return self.connected
+
+	def close(self):
+		self.connected = False
+
+
+class FakeBrowserType:
+	def __init__(self, fail=False):
+		self.launched = []
+		self.fail = fail
+
+	def launch(self, headless=True):
+		if self.fail:
+			raise RuntimeError("launch failed")
+		b = FakeBrowser()
+		self.launched.append(b)
+		return b
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+	chromium = FakeBrowserType()
+	firefox = FakeBrowserType(fail=True)  # e.g. not installed on this host
+
+	class _Manager:
+		def __enter__(self):
+			return types.SimpleNamespace(chromium=chromium, firefox=firefox)
+
+		def __exit__(self, *exc):
+			return False
+
+	module = types.ModuleType("playwright.sync_api")
+	module.sync_playwright = _Manager
+	monkeypatch.setitem(sys.modules, "playwright.sync_api", module)
+	return chromium
+
+
+@pytest.fixture
+def pool(fake_playwright):
+	p = BrowserPool(["chromium"])
+	p.start()
+	assert p.ready.wait(5)
+	yield p
+	p.stop()
+
+
+def test_runs_jobs_on_the_pooled_browser(pool, fake_playwright):
+	assert pool.run("chromium", lambda b: b) is fake_playwright.launched[0]
+	assert pool.has("chromium")
+	assert not pool.has("firefox")
+
+
+def test_relaunches_disconnected_browser(pool, fake_playwright):
+	fake_playwright.launched[0].connected = False
+	browser = pool.run("chromium", lambda b: b)
+	assert browser is fake_playwright.launched[1]
+	assert pool.status()["relaunches"] == 1
+
+
+def test_drops_browser_that_cannot_relaunch(pool, fake_playwright):
+	fake_playwright.launched[0].connected = False
+	fake_playwright.fail = True
+	with pytest.raises(BrowserPoolUnavailable):
+		pool.run("chromium", lambda b: b)
+	assert not pool.has("chromium")
+
+
+def test_job_errors_are_not_reported_as_unavailable(pool):
+	def boom(_):
+		raise ValueError("case blew up")
+
+	with pytest.raises(ValueError):
+		pool.run("chromium", boom)
+
+
+def test_jobs_after_stop_fail_instead_of_hanging(pool):
+	gate = threading.Event()
+	blocker = pool.submit("chromium", lambda b: gate.wait(5))
+	pool._jobs.put(None)
+	late = pool.submit("chromium", lambda b: "never runs")
+	gate.set()
+	assert blocker.result(5) is True
+	with pytest.raises(BrowserPoolUnavailable):
+		late.result(5)
+	pool.stop()
+	with pytest.raises(BrowserPoolUnavailable):
+		pool.run("chromium", lambda b: b, timeout=1)
+
+
+def test_failed_initial_launch_drops_only_that_browser(fake_playwright):
+	p = BrowserPool(["chromium", "firefox"])
+	p.start()
+	try:
+		assert p.ready.wait(5)
+		assert p.error is None
+		assert p.has("chromium")
+		assert not p.has("firefox")
+		assert "firefox" in p.status()["dropped"]
+		assert p.run("chromium", lambda b: b) is fake_playwright.launched[0]
+		with pytest.raises(BrowserPoolUnavailable):
+			p.run("firefox", lambda b: b)
+	finally:
+		p.stop()
+
+
+def _state_pool(tmp_path, monkeypatch, install):
+	state = tmp_path / "state.json"
+	state.write_text("{}")  # left over from a previous boot
+	monkeypatch.setattr(BrowserPool, "_install_state", install)
+	return BrowserPool(["chromium"], storage_state_path=str(state)), state
+
+
+def test_state_is_not_reported_before_warmup_or_after_it_fails(tmp_path, monkeypatch, fake_playwright):
+	gate = threading.Event()
+
+	def failing_install(self):
+		gate.wait(5)
+		raise RuntimeError("target unreachable")
+
+	p, _ = _state_pool(tmp_path, monkeypatch, failing_install)
+	p.start()
+	try:
+		assert p.storage_state() is None
+		gate.set()
+		assert p.ready.wait(5)
+		assert p.state_error == "target unreachable"
+		assert p.storage_state() is None
+		assert p.storage_state(wait=1) is None
+	finally:
+		p.stop()
+
+
+def test_cases_queued_during_warmup_get_the_state(tmp_path, monkeypatch, fake_playwright, recorded_runs):
+	gate = threading.Event()
+
+	def slow_install(self):
+		gate.wait(5)
+
+	p, state = _state_pool(tmp_path, monkeypatch, slow_install)
+	p.start()
+	try:
+		done = []
+		t = threading.Thread(target=lambda: done.append(_run_case(tmp_path, p)))
+		t.start()
+		gate.set()
+		t.join(5)
+		assert done and recorded_runs[0]["storage_state"] == str(state)
+	finally:
+		p.stop()
+
+
+def test_run_times_out_while_queued():
+	p = BrowserPool(["chromium"])  # never started, so nothing drains the queue
+	with pytest.raises(BrowserPoolUnavailable):
+		p.run("chromium", lambda b: b, timeout=0.05)
+
+
+class FakePool:
+	def __init__(self, exc=None, state="/tmp/state.json"):
+		self.exc = exc
+		self.state = state
+		self.calls = 0
+		self.waits = []
+
+	def has(self, name):
+		return True
+
+	def storage_state(self, wait=None):
+		self.waits.append(wait)
+		return self.state
+
+	def run(self, name, fn):
+		self.calls += 1
+		if self.exc:
+			raise self.exc
+		return fn("pooled-browser")
+
+
+@pytest.fixture
+def recorded_runs(monkeypatch):
+	calls = []
+
+	def fake_run_test(self, case, run_id, browser=None, storage_state=None):
+		calls.append({"browser": browser, "storage_state": storage_state})
+		return {"case_id": case["id"], "browser": self.browser_name, "result": {"status": "completed"}}
+
+	monkeypatch.setattr(ExecutorAgent, "run_test", fake_run_test)
+	return calls
+
+
+def _run_case(tmp_path, pool):
+	orch = OrchestratorAgent(str(tmp_path), browsers=["chromium"], pool=pool)
+	return orch._run_case(ExecutorAgent("chromium", str(tmp_path)), {"id": "TC001"}, "r")
+
+
+def test_pooled_run_uses_saved_state(tmp_path, recorded_runs):
+	_run_case(tmp_path, FakePool())
+	assert recorded_runs == [{"browser": "pooled-browser", "storage_state": "/tmp/state.json"}]
+
+
+def test_falls_back_cold_with_same_state_when_pool_unavailable(tmp_path, recorded_runs):
+	pool = FakePool(exc=BrowserPoolUnavailable("down"))
+	res = _run_case(tmp_path, pool)
+	assert res["result"]["status"] == "completed"
+	assert recorded_runs == [{"browser": None, "storage_state": "/tmp/state.json"}]
+	assert pool.waits and pool.waits[-1] is not None  # cold runs wait for warm-up first
+
+
+def test_other_pool_errors_are_reported_not_rerun(tmp_path, recorded_runs):
+	res = _run_case(tmp_path, FakePool(exc=TimeoutError("case still running")))
+	assert res["result"]["status"] == "error"
+	assert "case still running" in res["result"]["details"]
+	assert recorded_runs == []
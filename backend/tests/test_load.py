@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+
+from app.agents.load import LoadTesterAgent, SimulatedPlayerAgent, percentile, summarize, validate_load_request
+
+
+def test_percentile_interpolates_between_ranks():
+	values = list(range(1, 11))
+	assert percentile(values, 0) == 1
+	assert percentile(values, 50) == 5.5
+	assert percentile(values, 95) == pytest.approx(9.55)
+	assert percentile(values, 100) == 10
+	assert percentile([], 50) == 0.0
+
+
+def test_summarize():
+	assert summarize([]) == {"count": 0}
+	s = summarize([10.0, 20.0, 30.0, 40.0])
+	assert s["count"] == 4
+	assert s["mean"] == 25.0
+	assert s["p50"] == 25.0
+	assert s["max"] == 40.0
+
+
+def test_aggregate_latency_throughput_and_timings(tmp_path):
+	players = [
+		{
+			"player_id": "player-001", "iterations": 2, "completed": 1, "errors": ["iteration 1: board not visible"],
+			"actions": [
+				{"iteration": 0, "action": "navigate", "ok": True, "latency_ms": 100.0},
+				{"iteration": 0, "action": "click_two_tiles_sum", "ok": True, "latency_ms": 50.0},
+				{"iteration": 1, "action": "wait_for_board", "ok": False, "latency_ms": 9000.0},
+			],
+			"perf": [{
+				"navigation": {"startTime": 0, "requestStart": 5, "responseStart": 25, "domContentLoadedEventEnd": 60, "loadEventEnd": 80},
+				"resources": [{"duration": 12, "transfer_size": 1000}, {"duration": 8, "transfer_size": 500}],
+				"long_tasks": [{"duration": 70}, {"duration": 120}],
+			}],
+		},
+		{
+			"player_id": "player-002", "iterations": 2, "completed": 2, "errors": [],
+			"actions": [{"iteration": 0, "action": "navigate", "ok": True, "latency_ms": 300.0}],
+			"perf": [],
+		},
+	]
+	agg = LoadTesterAgent(str(tmp_path), players=2).aggregate(players, wall_s=2.0)
+
+	assert agg["sessions_completed"] == 3
+	assert agg["sessions_attempted"] == 4
+	assert agg["actions_total"] == 4
+	assert agg["actions_failed"] == 1
+	assert agg["throughput"] == {"sessions_per_s": 1.5, "actions_per_s": 1.5}
+	# Failed actions are excluded from latency percentiles
+	assert agg["latency_ms"]["all_actions"]["max"] == 300.0
+	assert agg["latency_ms"]["by_action"]["navigate"]["p50"] == 200.0
+	assert "wait_for_board" not in agg["latency_ms"]["by_action"]
+	assert agg["navigation_ms"]["ttfb"]["p50"] == 20
+	assert agg["navigation_ms"]["load"]["max"] == 80
+	assert agg["resources"]["count"] == 2
+	assert agg["resources"]["transfer_bytes"] == 1500
+	assert agg["long_tasks"] == {"count": 2, "total_ms": 190, "duration_ms": summarize([70, 120])}
+	assert agg["errors"] == ["iteration 1: board not visible"]
+
+
+@pytest.mark.parametrize("kwargs", [
+	{"players": 0},
+	{"players": 10_000},
+	{"iterations": 10_000},
+	{"browser": "__class__"},
+	{"target_url": "file:///etc/passwd"},
+	{"target_url": "javascript:alert(1)"},
+	{"target_url": "http://"},
+])
+def test_validate_load_request_rejects(kwargs):
+	with pytest.raises(ValueError):
+		validate_load_request(**kwargs)
+
+
+def test_validate_load_request_accepts():
+	validate_load_request(players=5, iterations=3, browser="chromium", target_url="http://localhost:9000/index.html")
+	validate_load_request()
+
+
+def test_constructor_caps_players(tmp_path):
+	assert LoadTesterAgent(str(tmp_path), players=10_000).players <= 50
+
+
+@pytest.mark.parametrize("fail_after_ready", [False, True])
+def test_ready_is_released_exactly_once(tmp_path, monkeypatch, fail_after_ready):
+	def fake_play(self, run_id, iterations, signal_ready, start_event):
+		if fail_after_ready:
+			signal_ready()
+		raise OSError("disk full")
+
+	monkeypatch.setattr(SimulatedPlayerAgent, "_play", fake_play)
+	ready = threading.Semaphore(0)
+	with pytest.raises(OSError):
+		SimulatedPlayerAgent("player-001", "chromium", str(tmp_path)).run_session("r", 1, ready)
+	assert ready.acquire(blocking=False)
+	assert not ready.acquire(blocking=False)
+
+
+def test_load_against_stand_in(tmp_path, chromium_available, stand_in_url):
+	tester = LoadTesterAgent(str(tmp_path), players=2, iterations=2, browser="chromium", target_url=stand_in_url)
+	run_id = tester.run_load(run_id="load-test")
+
+	load = json.loads((tmp_path / run_id / "load.json").read_text())
+	agg = load["aggregate"]
+	assert agg["sessions_completed"] == 4, agg["errors"]
+	assert agg["latency_ms"]["by_action"]["click_two_tiles_sum"]["count"] == 4
+	assert agg["navigation_ms"]["load"]["count"] == 4
+	assert (tmp_path / run_id / "load" / "player-001" / "perf.json").exists()
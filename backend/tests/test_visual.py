@@ -0,0 +1,222 @@
+import json
+import threading
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+from app.agents import visual
+from app.agents.analyzer import AnalyzerAgent
+from app.agents.visual import VisualRegressionAgent, hamming, phash, target_key
+
+REAL = "https://play.ezygamers.com/"
+STAND_IN = "http://localhost:9000/index.html"
+
+
+def screen(kind="board", height=900, seed=0):
+	rng = np.random.default_rng(seed)
+	img = Image.new("RGB", (800, height), "white")
+	d = ImageDraw.Draw(img)
+	d.rectangle([0, 0, 800, 80], fill=(40, 60, 160))
+	if kind == "board":
+		for r in range(6):
+			for c in range(6):
+				x, y = 150 + c * 85, 200 + r * 85
+				d.rectangle([x, y, x + 80, y + 80], fill=(230, 230, 230), outline="black")
+				d.text((x + 35, y + 35), str(rng.integers(1, 10)), fill="black")
+	elif kind == "dark":
+		d.rectangle([0, 80, 400, height], fill=(20, 20, 20))
+	return img
+
+
+def thumb(img):
+	return np.asarray(img.convert("L").resize((visual.DIFF_SIZE, visual.DIFF_SIZE)), dtype=np.uint8)
+
+
+def write_run(artifacts, run_id, kinds, status="completed", target_url=REAL, height=900):
+	results = []
+	for i, kind in enumerate(kinds):
+		case_id = f"TC{i + 1:03d}"
+		case_dir = artifacts / run_id / case_id / "chromium"
+		case_dir.mkdir(parents=True, exist_ok=True)
+		screen(kind, height=height, seed=zlib.crc32(run_id.encode()) + i).save(case_dir / "final.png")
+		results.append({
+			"case_id": case_id, "browser": "chromium", "target_url": target_url,
+			"result": {"status": status, "details": ""},
+			"artifacts": {"screenshot": str(case_dir / "final.png")},
+		})
+	(artifacts / run_id / "results.json").write_text(json.dumps(results))
+
+
+@pytest.fixture
+def dirs(tmp_path):
+	return tmp_path / "artifacts", tmp_path / "data", tmp_path / "reports"
+
+
+def analyze(dirs, run_id):
+	artifacts, data, reports = dirs
+	return AnalyzerAgent(str(reports), data_dir=str(data)).analyze_run(run_id, str(artifacts))
+
+
+def by_case(report):
+	return {t["case_id"]: t for t in report["tests"]}
+
+
+def test_phash_is_stable_for_noise_and_separates_layouts():
+	hashes = phash(np.stack([thumb(screen(seed=1)), thumb(screen(seed=2)), thumb(screen("blank")), thumb(screen("dark"))]))
+	assert hashes.shape == (4, 8) and hashes.dtype == np.uint8
+	dist = hamming(hashes, hashes)
+	assert dist.shape == (4, 4)
+	assert (np.diag(dist) == 0).all()
+	assert dist[0, 1] <= visual.HASH_THRESHOLD
+	assert dist[0, 2] > visual.HASH_THRESHOLD
+	assert dist[0, 3] > visual.HASH_THRESHOLD
+
+
+def test_random_tiles_stay_under_default_threshold():
+	# The game deals new digits every time; that alone must not read as a layout change
+	hashes = phash(np.stack([thumb(screen(seed=s)) for s in range(60)]))
+	assert hamming(hashes[:1], hashes).max() <= visual.HASH_THRESHOLD
+	broken = phash(np.stack([thumb(screen("blank")), thumb(screen("dark"))]))
+	assert hamming(broken, hashes).min() > visual.HASH_THRESHOLD
+
+
+def test_baselines_are_keyed_by_target(tmp_path):
+	agent = VisualRegressionAgent(str(tmp_path))
+	assert target_key(REAL) != target_key(STAND_IN)
+	assert target_key(REAL) == target_key(None)  # legacy results fall back to the default target
+	assert agent.baseline_path("TC001", "chromium", REAL) != agent.baseline_path("TC001", "chromium", STAND_IN)
+
+
+def test_no_auto_baseline_by_default(dirs):
+	artifacts, data, _ = dirs
+	write_run(artifacts, "r1", ["board"])
+	report = analyze(dirs, "r1")
+	assert report["visual"]["summary"]["no_baseline"] == 1
+	assert by_case(report)["TC001"]["verdict"] == "pass"
+	assert not (data / "baselines").exists()
+
+
+def test_auto_baseline_is_unreviewed_and_does_not_fail(dirs, monkeypatch):
+	artifacts, _, _ = dirs
+	monkeypatch.setattr(visual, "AUTO_BASELINE", True)
+	write_run(artifacts, "r1", ["board"])
+	first = analyze(dirs, "r1")
+	assert first["visual"]["summary"]["new_baseline"] == 1
+	assert first["tests"][0]["visual"]["chromium"]["baseline_reviewed"] is False
+
+	write_run(artifacts, "r2", ["blank"])
+	second = by_case(analyze(dirs, "r2"))["TC001"]
+	assert second["visual"]["chromium"]["visual"] == "changed_unreviewed"
+	assert second["verdict"] == "pass"
+	assert "unreviewed" in second["triage_notes"]
+
+
+def test_reviewed_baseline_fails_changed_render(dirs):
+	artifacts, data, _ = dirs
+	write_run(artifacts, "good", ["board", "board"])
+	assert VisualRegressionAgent(str(data)).promote_run("good", str(artifacts)) == 2
+
+	write_run(artifacts, "r2", ["board", "blank"])
+	tests = by_case(analyze(dirs, "r2"))
+	assert tests["TC001"]["verdict"] == "pass"
+	assert tests["TC001"]["visual"]["chromium"]["visual"] == "match"
+	assert tests["TC002"]["verdict"] == "fail"
+	assert tests["TC002"]["triage_notes"] == "Visual regression"
+	assert tests["TC002"]["visual"]["chromium"]["cluster"].startswith("VC")
+
+
+def test_promote_skips_failed_cases_unless_named(dirs):
+	artifacts, data, _ = dirs
+	write_run(artifacts, "ok", ["board"])
+	write_run(artifacts, "bad", ["blank"], status="error")
+	# Mixed run: TC001 completed, TC002 errored
+	mixed = json.loads((artifacts / "ok" / "results.json").read_text())
+	mixed += [dict(r, case_id="TC002") for r in json.loads((artifacts / "bad" / "results.json").read_text())]
+	(artifacts / "mixed").mkdir()
+	(artifacts / "mixed" / "results.json").write_text(json.dumps(mixed))
+
+	agent = VisualRegressionAgent(str(data))
+	assert agent.promote_run("mixed", str(artifacts)) == 1
+	assert agent.baseline_path("TC001", "chromium", REAL).exists()
+	assert not agent.baseline_path("TC002", "chromium", REAL).exists()
+	assert agent.promote_run("mixed", str(artifacts), case_id="TC002") == 1
+	assert agent.baseline_path("TC002", "chromium", REAL).exists()
+
+
+def test_page_height_change_is_a_change(dirs):
+	artifacts, data, _ = dirs
+	write_run(artifacts, "good", ["board"])
+	VisualRegressionAgent(str(data)).promote_run("good", str(artifacts))
+	write_run(artifacts, "taller", ["board"], height=1000)
+	entry = analyze(dirs, "taller")["tests"][0]["visual"]["chromium"]
+	assert entry["size_changed"] is True
+	assert entry["visual"] == "changed"
+
+
+def test_stand_in_run_does_not_touch_real_target_baselines(dirs):
+	artifacts, data, _ = dirs
+	write_run(artifacts, "good", ["board"])
+	VisualRegressionAgent(str(data)).promote_run("good", str(artifacts))
+	write_run(artifacts, "stand-in", ["blank"], target_url=STAND_IN)
+	report = analyze(dirs, "stand-in")
+	assert report["visual"]["summary"]["no_baseline"] == 1
+	assert report["tests"][0]["verdict"] == "pass"
+
+
+def test_clusters_are_idempotent_and_span_runs(dirs):
+	artifacts, data, _ = dirs
+	write_run(artifacts, "good", ["board"] * 4)
+	VisualRegressionAgent(str(data)).promote_run("good", str(artifacts))
+	write_run(artifacts, "r2", ["blank", "blank", "dark", "board"])
+	first = analyze(dirs, "r2")["visual"]["clusters"]
+	again = analyze(dirs, "r2")["visual"]["clusters"]
+	assert first == again
+	assert sorted(c["size_in_run"] for c in first) == [1, 2]
+
+	write_run(artifacts, "r3", ["blank", "board", "board", "board"])
+	(blank,) = analyze(dirs, "r3")["visual"]["clusters"]
+	assert blank["cluster_id"] == next(c["cluster_id"] for c in first if c["size_in_run"] == 2)
+	assert blank["total_size"] == 3
+	assert blank["runs"] == 2
+
+
+def test_error_runs_are_clustered_without_baseline(dirs):
+	artifacts, _, _ = dirs
+	write_run(artifacts, "r1", ["blank", "blank"], status="error")
+	report = analyze(dirs, "r1")
+	assert report["summary"]["fail"] == 2
+	assert [c["size_in_run"] for c in report["visual"]["clusters"]] == [2]
+
+
+def test_concurrent_runs_keep_all_cluster_members(tmp_path):
+	agent = VisualRegressionAgent(str(tmp_path))
+	h = phash(thumb(screen("blank"))[None])[0].tobytes().hex()
+
+	def worker(n):
+		agent._cluster(f"run-{n}", [{"case_id": "TC001", "browser": "chromium", "phash": h}])
+
+	threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+	for t in threads:
+		t.start()
+	for t in threads:
+		t.join()
+	(cluster,) = json.loads((tmp_path / "visual_index.json").read_text())["clusters"]
+	assert len(cluster["members"]) == 8
+
+
+def test_visual_failure_keeps_status_report(dirs, monkeypatch):
+	artifacts, _, _ = dirs
+	write_run(artifacts, "r1", ["board"], status="error")
+
+	def broken(self, run_id, results):
+		raise PermissionError("data/baselines is read-only")
+
+	monkeypatch.setattr(VisualRegressionAgent, "compare_run", broken)
+	report = analyze(dirs, "r1")
+	assert report["summary"] == {"total": 1, "pass": 0, "fail": 1, "flaky": 0}
+	assert report["visual"]["enabled"] is False
+	assert "read-only" in report["visual"]["reason"]
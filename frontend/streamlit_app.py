@@ -61,6 +61,25 @@ with col2:
 		artifacts_url = f"{api}/artifacts/{run_id}/"
 		st.write("Artifacts root:", artifacts_url)
 
+st.subheader("Load Test")
+lc1, lc2, lc3 = st.columns(3)
+with lc1:
+	load_players = st.number_input("Simulated players", min_value=1, max_value=50, value=5)
+with lc2:
+	load_iterations = st.number_input("Games per player", min_value=1, max_value=20, value=3)
+with lc3:
+	load_target = st.text_input("Target URL (blank = default)", value="")
+if st.button("Run Load Test"):
+	payload = {"players": int(load_players), "iterations": int(load_iterations), "browser": browsers[0] if browsers else None}
+	if load_target:
+		payload["target_url"] = load_target
+	resp = client.post(f"{api}/load", json=payload)
+	if resp.status_code == 200:
+		st.session_state["run_id"] = resp.json().get("run_id", "")
+		st.success(f"Load run started: {st.session_state['run_id']}")
+	else:
+		st.error(resp.text)
+
 st.subheader("3) Analyze & Report")
 col3, col4 = st.columns(2)
 with col3:
@@ -87,10 +106,34 @@ if report:
 	c1.metric("Pass", sumry.get("pass", 0))
 	c2.metric("Fail", sumry.get("fail", 0))
 	c3.metric("Flaky", sumry.get("flaky", 0))
+	load = report.get("load")
+	if load:
+		st.subheader("Load Test")
+		agg = load.get("aggregate", {})
+		lat = agg.get("latency_ms", {}).get("all_actions", {})
+		m1, m2, m3, m4 = st.columns(4)
+		m1.metric("Action p50 (ms)", lat.get("p50", 0))
+		m2.metric("Action p95 (ms)", lat.get("p95", 0))
+		m3.metric("Action p99 (ms)", lat.get("p99", 0))
+		m4.metric("Actions/s", agg.get("throughput", {}).get("actions_per_s", 0))
+		st.json({k: agg.get(k) for k in ["latency_ms", "navigation_ms", "resources", "long_tasks", "throughput"]})
+		st.json(load.get("players", []))
+	visual = report.get("visual")
+	if visual and visual.get("enabled"):
+		st.subheader("Visual Regression")
+		vs = visual.get("summary", {})
+		v1, v2, v3, v4 = st.columns(4)
+		v1.metric("Compared", vs.get("compared", 0))
+		v2.metric("Changed", vs.get("changed", 0))
+		v3.metric("New baselines", vs.get("new_baseline", 0))
+		v4.metric("Clusters", len(visual.get("clusters", [])))
+		for c in visual.get("clusters", []):
+			st.write(f"{c['cluster_id']}: {c['size_in_run']} in this run, {c['total_size']} across {c['runs']} run(s) - first seen {c['first_seen']}")
+			st.caption(", ".join(c.get("members", [])))
 	st.subheader("Tests")
 	for t in report.get("tests", [])[:10]:
 		with st.expander(f"{t.get('case_id')} - {t.get('verdict')}"):
-			st.json({k: t[k] for k in ['verdict','reproducibility','triage_notes']})
+			st.json({k: t[k] for k in ['verdict','reproducibility','triage_notes','visual'] if k in t})
 			for browser, art in (t.get("evidence") or {}).items():
 				st.write(browser)
 				img = art.get("screenshot")
@@ -101,6 +144,12 @@ if report:
 					if idx is not None:
 						rel = '/'.join(parts[idx:])
 						st.image(urljoin(api + '/', rel))
+				diff = ((t.get("visual") or {}).get(browser) or {}).get("diff_image")
+				if diff:
+					parts = diff.replace('\\', '/').split('/')
+					idx = parts.index('artifacts') if 'artifacts' in parts else None
+					if idx is not None:
+						st.image(urljoin(api + '/', '/'.join(parts[idx:])), caption="visual diff vs baseline")
 				logf = art.get("log")
 				if logf:
 					parts = logf.replace('\\', '/').split('/')